@@ -49,6 +49,7 @@ associated GPIO channel number.
 """
 import logging
 import os
+import threading
 import time
 from logging import NullHandler
 
@@ -69,11 +70,77 @@ IN = 0
 OUT = 1
 PUD_UP = 1
 PUD_DOWN = 0
+RISING = 31
+FALLING = 32
+BOTH = 33
 
 MODES = {'BOARD': BOARD, 'BCM': BCM}
+# Time in seconds between two checks for a listening thread's exception while
+# blocking in wait_for_edge()
+_THREAD_CHECK_INTERVAL = 0.1
 manager = SimulRPi.manager.Manager()
 
 
+def add_event_callback(channel, callback):
+    """Add a callback for an input channel whose edge detection is already
+    enabled with :meth:`add_event_detect`.
+
+    Parameters
+    ----------
+    channel : int
+        Input channel number based on the numbering system you have specified
+        (`BOARD` or `BCM`).
+    callback : function
+        Function called with the channel number as argument each time an edge
+        is detected. It is called from the listening thread.
+
+    Raises
+    ------
+    RuntimeError
+        Raised if the edge detection is not enabled for the given channel.
+
+    """
+    manager.add_event_callback(channel, callback)
+
+
+def add_event_detect(channel, edge, callback=None, bouncetime=None):
+    """Enable the edge detection for an input channel.
+
+    When simulating, a falling edge happens when the keyboard key associated
+    with the channel is pressed and a rising edge when the key is released.
+    The listening thread is also started if possible.
+
+    Parameters
+    ----------
+    channel : int
+        Input channel number based on the numbering system you have specified
+        (`BOARD` or `BCM`).
+    edge : int
+        Type of edge to detect: `GPIO.RISING`, `GPIO.FALLING` or `GPIO.BOTH`.
+    callback : function, optional
+        Function called with the channel number as argument each time an edge
+        is detected. It is called from the listening thread.
+    bouncetime : int, optional
+        Time in milliseconds during which edges following a detected edge are
+        ignored (switch debounce).
+
+    Raises
+    ------
+    RuntimeError
+        Raised if the channel is not setup as an input channel or if the edge
+        detection is already enabled for the channel.
+    ValueError
+        Raised if `edge` is not `GPIO.RISING`, `GPIO.FALLING` or `GPIO.BOTH`.
+
+    References
+    ----------
+    `RPi.GPIO wiki <https://sourceforge.net/p/raspberry-gpio-python/wiki/Inputs/>`__
+
+    """
+    manager.add_event_detect(channel, edge, callback, bouncetime)
+    _start_listening_thread()
+
+
 def cleanup():
     """Clean up any resources (e.g. GPIO channels).
 
@@ -115,6 +182,8 @@ def cleanup():
     # channels for LEDs, then the displaying thread was never started
     if manager.th_display_leds.is_alive():
         manager.th_display_leds.do_run = False
+        # Wake up the displaying thread so it doesn't wait for an update
+        manager.leds_updated.set()
         manager.th_display_leds.join()
         logger.debug("Thread stopped: {}".format(manager.th_display_leds.name))
     # Check if listening thread is alive. If the user didn't setup any input
@@ -128,6 +197,25 @@ def cleanup():
     manager = SimulRPi.manager.Manager()
 
 
+def event_detected(channel):
+    """Check if an edge was detected on an input channel since the last call.
+
+    Parameters
+    ----------
+    channel : int
+        Input channel number based on the numbering system you have specified
+        (`BOARD` or `BCM`).
+
+    Returns
+    -------
+    retval : bool
+        Returns `True` if an edge (as configured with :meth:`add_event_detect`)
+        was detected since the last call. Otherwise, it returns `False`.
+
+    """
+    return manager.event_detected(channel)
+
+
 def input(channel):
     """Read the value of a GPIO pin.
 
@@ -171,12 +259,7 @@ def input(channel):
         already caught exception.
 
     """
-    # Start the listening thread only if it is not already alive and there is no
-    # exception in the thread's target function
-    if manager.th_listener:
-        if not manager.th_listener.exc and not manager.th_listener.is_alive():
-            manager.th_listener.start()
-        _raise_if_thread_exception(manager.th_listener.name)
+    _start_listening_thread()
     return manager.pin_db.get_pin_state(channel)
 
 
@@ -233,14 +316,33 @@ def output(channel, state):
             assert len(state) == len(channel), \
                 "There should be as many output states as channels: " \
                 "states = {} and channels = {}".format(state, channel)
-    for idx, ch in enumerate(channel):
-        manager.pin_db.set_pin_state_from_channel(ch, state[idx])
+    # Resolve the pin database's setter once for the whole batch of channels
+    set_pin_state = manager.pin_db.set_pin_state_from_channel
+    for ch, st in zip(channel, state):
+        set_pin_state(ch, st)
+    # The displaying thread redraws all the LEDs once for this batch
+    manager.leds_updated.set()
     # Start the displaying thread only if it is not already alive and there is
-    # no exception in the thread's target function
-    if not manager.th_display_leds.exc and \
-            not manager.th_display_leds.is_alive():
-        manager.th_display_leds.start()
-    _raise_if_thread_exception(manager.th_display_leds.name)
+    # no exception in the thread's target function. Otherwise, the thread's
+    # exception is raised (only once).
+    th_display_leds = manager.th_display_leds
+    if th_display_leds.exc:
+        _raise_if_thread_exception(th_display_leds.name)
+    elif not th_display_leds.is_alive():
+        th_display_leds.start()
+
+
+def remove_event_detect(channel):
+    """Disable the edge detection for an input channel.
+
+    Parameters
+    ----------
+    channel : int
+        Input channel number based on the numbering system you have specified
+        (`BOARD` or `BCM`).
+
+    """
+    manager.remove_event_detect(channel)
 
 
 def setchannelnames(channel_names):
@@ -506,8 +608,9 @@ def setup(channel, channel_type, pull_up_down=None, initial=None):
 
     """
     channel = [channel] if isinstance(channel, int) else channel
+    add_pin = manager.add_pin
     for ch in channel:
-        manager.add_pin(ch, channel_type, pull_up_down, initial)
+        add_pin(ch, channel_type, pull_up_down, initial)
 
 
 def setwarnings(show_warnings):
@@ -536,7 +639,9 @@ def wait(timeout=2):
     was an exception caught and saved by one thread, then it is raised here.
 
     If more than ``timeout`` seconds elapsed without any of the events
-    described previously happening, the function exits.
+    described previously happening, the function exits. A thread exception is
+    only raised once: the following calls wait for the whole ``timeout``
+    again.
 
     Parameters
     ----------
@@ -571,16 +676,91 @@ def wait(timeout=2):
 
     """
     # logger.debug("Waiting after threads...")
-    start = time.time()
-    while True:
-        if not manager.th_display_leds.is_alive() or \
-                (manager.th_listener and not manager.th_listener.is_alive()):
-            _raise_if_thread_exception('all')
-        if (time.time() - start) > timeout:
-            break
+    end = time.monotonic() + timeout
+    # An exception not raised yet (e.g. caught by both threads) is raised
+    # right away
+    _raise_if_thread_exception('all')
+    # Block until a thread catches an exception (or the timeout expires)
+    # instead of polling the threads. If the event was set for an exception
+    # already raised (e.g. by output()), we keep waiting for the remaining
+    # time.
+    th_exception_caught = manager.th_exception_caught
+    while th_exception_caught.wait(max(end - time.monotonic(), 0)):
+        th_exception_caught.clear()
+        _raise_if_thread_exception('all')
     # logger.debug("Good, no thread exception raised!")
 
 
+def wait_for_edge(channel, edge, bouncetime=None, timeout=None):
+    """Block until an edge is detected on an input channel.
+
+    When simulating, a falling edge happens when the keyboard key associated
+    with the channel is pressed and a rising edge when the key is released.
+    The function waits on a :class:`threading.Event` that is set from the
+    listening thread, i.e. it doesn't poll the channel's state.
+
+    Parameters
+    ----------
+    channel : int
+        Input channel number based on the numbering system you have specified
+        (`BOARD` or `BCM`).
+    edge : int
+        Type of edge to wait for: `GPIO.RISING`, `GPIO.FALLING` or
+        `GPIO.BOTH`.
+    bouncetime : int, optional
+        Time in milliseconds during which edges following a detected edge are
+        ignored (switch debounce).
+    timeout : int, optional
+        Maximum time in milliseconds to wait for the edge. By default, there
+        is no timeout.
+
+    Returns
+    -------
+    channel : :obj:`int` or :obj:`None`
+        The channel number if an edge was detected or :obj:`None` if the
+        timeout expired.
+
+    Raises
+    ------
+    RuntimeError
+        Raised if the channel is not setup as an input channel or if the edge
+        detection is already enabled for the channel with
+        :meth:`add_event_detect`.
+    ValueError
+        Raised if `edge` is not `GPIO.RISING`, `GPIO.FALLING` or `GPIO.BOTH`.
+    Exception
+        If the listening thread caught an exception, it will be raised here.
+
+    References
+    ----------
+    `RPi.GPIO wiki <https://sourceforge.net/p/raspberry-gpio-python/wiki/Inputs/>`__
+
+    """
+    edge_event = threading.Event()
+    manager.add_event_detect(channel, edge,
+                             callback=lambda ch: edge_event.set(),
+                             bouncetime=bouncetime)
+    try:
+        _start_listening_thread()
+        deadline = None if timeout is None \
+            else time.monotonic() + timeout / 1000
+        wait_time = _THREAD_CHECK_INTERVAL
+        while True:
+            if deadline is not None:
+                wait_time = min(_THREAD_CHECK_INTERVAL,
+                                deadline - time.monotonic())
+            if edge_event.wait(max(wait_time, 0)):
+                return channel
+            # The listening thread's exception would otherwise never be
+            # raised since we are not calling input()
+            if manager.th_listener:
+                _raise_if_thread_exception(manager.th_listener.name)
+            if deadline is not None and time.monotonic() >= deadline:
+                return None
+    finally:
+        manager.remove_event_detect(channel)
+
+
 def _raise_if_thread_exception(which_threads):
     """TODO
 
@@ -597,9 +777,31 @@ def _raise_if_thread_exception(which_threads):
                 not manager.th_display_leds.exception_raised:
             # Happens when error in Manager.display_leds()
             manager.th_display_leds.exception_raised = True
+            # wait() must not wake up for an exception already raised
+            manager.th_exception_caught.clear()
             raise manager.th_display_leds.exc
     if manager.th_listener and which_threads in [manager.th_listener.name, 'all']:
         if manager.th_listener.exc and not manager.th_listener.exception_raised:
             # Happens when error in Manager.on_press() and/or Manager.on_release()
             manager.th_listener.exception_raised = True
+            manager.th_exception_caught.clear()
             raise manager.th_listener.exc
+
+
+def _start_listening_thread():
+    """Start the listening thread if possible.
+
+    The listening thread is started only if it is not already alive and there
+    is no exception in the thread's callbacks. See :meth:`input` for the
+    reason.
+
+    Raises
+    ------
+    Exception
+        If the listening thread caught an exception, it will be raised here.
+
+    """
+    if manager.th_listener:
+        if not manager.th_listener.exc and not manager.th_listener.is_alive():
+            manager.th_listener.start()
+        _raise_if_thread_exception(manager.th_listener.name)
@@ -12,6 +12,7 @@ import copy
 import logging
 import os
 import threading
+import time
 from logging import NullHandler
 
 try:
@@ -26,12 +27,17 @@ except ImportError:
 # if circular import
 # AttributeError: module 'SimulRPi' has no attribute 'GPIO
 import SimulRPi.GPIO
-from SimulRPi.mapping import default_key_to_channel_map
+from SimulRPi.mapping import (default_channel_to_key_map,
+                               default_key_to_channel_map)
 from SimulRPi.pindb import PinDB
 
 logger = logging.getLogger(__name__)
 logger.addHandler(NullHandler())
 
+# Maximum time in seconds the displaying thread waits for LEDs to be updated
+# before redrawing them anyway, e.g. to show new channel names or LED symbols
+DISPLAY_REFRESH_TIMEOUT = 0.1
+
 
 class DisplayExceptionThread(threading.Thread):
     """A subclass from :class:`threading.Thread` that defines threads that can
@@ -44,6 +50,10 @@ class DisplayExceptionThread(threading.Thread):
         is `False`.
     exc: :class:`Exception`
         Represents the exception raised by the target function.
+    exc_event : :class:`threading.Event` or :obj:`None`
+        Event set when an exception is caught so that a waiting thread (e.g.
+        :meth:`SimulRPi.GPIO.wait`) wakes up right away. By default, it is
+        :obj:`None`, i.e. no event is set.
 
     References
     ----------
@@ -51,10 +61,11 @@ class DisplayExceptionThread(threading.Thread):
 
     """
 
-    def __init__(self, *args, **kwargs):
+    def __init__(self, *args, exc_event=None, **kwargs):
         threading.Thread.__init__(self, *args, **kwargs)
         self.exception_raised = False
         self.exc = None
+        self.exc_event = exc_event
 
     def run(self):
         """Method representing the thread’s activity.
@@ -85,6 +96,8 @@ class DisplayExceptionThread(threading.Thread):
         except Exception as e:
             # TODO: important add a method to raise the exception
             self.exc = e
+            if self.exc_event:
+                self.exc_event.set()
 
 
 if keyboard:
@@ -107,7 +120,8 @@ class Manager:
     for pressed/released keys, and the default keymap.
 
     The threads are not started right away in ``__init__()`` but in
-    :meth:`SimulRPi.GPIO.input` for the listening thread and
+    :meth:`SimulRPi.GPIO.input`, :meth:`SimulRPi.GPIO.add_event_detect` and
+    :meth:`SimulRPi.GPIO.wait_for_edge` for the listening thread and
     :meth:`SimulRPi.GPIO.output` for the displaying thread.
 
     They are eventually stopped in :meth:`SimulRPi.GPIO.cleanup`.
@@ -143,6 +157,18 @@ class Manager:
     channel_to_key_map : dict
         The reverse dictionary of ``key_to_channel_map``. It maps channels to
         keys.
+    event_detects : dict
+        A dictionary that maps input channel numbers (:obj:`int`) to their
+        edge detection settings (:obj:`dict`) as added with
+        :meth:`add_event_detect`.
+    leds_updated : threading.Event
+        Event set by :meth:`SimulRPi.GPIO.output` when output channels are
+        updated so that the displaying thread redraws the LEDs. Thus, the
+        updates done in between two redraws are shown all at once.
+    th_exception_caught : threading.Event
+        Event set when the displaying or listening thread catches an
+        exception. :meth:`SimulRPi.GPIO.wait` blocks on it instead of polling
+        the threads.
     th_display_leds : manager.DisplayExceptionThread
         Thread responsible for displaying blinking red dots in the terminal as
         to simulate LEDs connected to an RPi.
@@ -191,12 +217,17 @@ class Manager:
         # TODO: call it _channel_cached_info?
         self._channel_tmp_info = {}
         self.key_to_channel_map = copy.copy(default_key_to_channel_map)
-        self.channel_to_key_map = {v: k for k, v in
-                                   self.key_to_channel_map.items()}
+        # NOTE: the reverse keymap is already computed once in
+        # SimulRPi.mapping, no need to rebuild it for each Manager
+        self.channel_to_key_map = copy.copy(default_channel_to_key_map)
+        self.event_detects = {}
+        self.leds_updated = threading.Event()
+        self.th_exception_caught = threading.Event()
         self.th_display_leds = DisplayExceptionThread(
             name="thread_display_leds",
             target=self.display_leds,
-            args=())
+            args=(),
+            exc_event=self.th_exception_caught)
         if keyboard:
             self.th_listener = KeyboardExceptionThread(
                 on_press=self.on_press,
@@ -205,6 +236,85 @@ class Manager:
         else:
             self.th_listener = None
 
+    def add_event_callback(self, channel_number, callback):
+        """Add a callback for an input channel whose edge detection is
+        already enabled.
+
+        Parameters
+        ----------
+        channel_number : int
+            GPIO channel number of an input channel whose edge detection was
+            enabled with :meth:`add_event_detect`.
+        callback : function
+            Function called with the channel number as argument each time an
+            edge is detected on the channel. It is called from the listening
+            thread ``th_listener``.
+
+        Raises
+        ------
+        RuntimeError
+            Raised if the edge detection is not enabled for the given channel.
+
+        """
+        event_detect = self.event_detects.get(channel_number)
+        if event_detect is None:
+            raise RuntimeError("Add event detection using add_event_detect "
+                               "first before adding a callback")
+        event_detect['callbacks'].append(callback)
+
+    def add_event_detect(self, channel_number, edge, callback=None,
+                         bouncetime=None):
+        """Enable the edge detection for an input channel.
+
+        An edge is detected when the state of the input channel changes
+        because its associated keyboard key is pressed (`GPIO.FALLING`) or
+        released (`GPIO.RISING`).
+
+        Parameters
+        ----------
+        channel_number : int
+            GPIO channel number of an input channel configured with
+            :meth:`SimulRPi.GPIO.setup`.
+        edge : int
+            Type of edge to detect: `GPIO.RISING`, `GPIO.FALLING` or
+            `GPIO.BOTH`.
+        callback : function, optional
+            Function called with the channel number as argument each time an
+            edge is detected on the channel. More callbacks can be added with
+            :meth:`add_event_callback`.
+        bouncetime : int, optional
+            Time in milliseconds during which edges following a detected edge
+            are ignored.
+
+        Raises
+        ------
+        RuntimeError
+            Raised if the channel is not setup as an input channel or if the
+            edge detection is already enabled for the channel.
+        ValueError
+            Raised if `edge` is not `GPIO.RISING`, `GPIO.FALLING` or
+            `GPIO.BOTH`.
+
+        """
+        pin = self.pin_db.get_pin_from_channel(channel_number)
+        if pin is None or pin.channel_type != SimulRPi.GPIO.IN:
+            raise RuntimeError("You must setup() the GPIO channel as an input "
+                               "first")
+        if channel_number in self.event_detects:
+            raise RuntimeError("Conflicting edge detection already enabled "
+                               "for this GPIO channel")
+        if edge not in [SimulRPi.GPIO.RISING, SimulRPi.GPIO.FALLING,
+                        SimulRPi.GPIO.BOTH]:
+            raise ValueError("The edge must be set to RISING, FALLING or "
+                             "BOTH")
+        self.event_detects[channel_number] = {
+            'edge': edge,
+            'bouncetime': bouncetime,
+            'callbacks': [callback] if callback else [],
+            'detected': False,
+            'last_edge_time': None
+        }
+
     def add_pin(self, channel_number, channel_type, pull_up_down=None, initial=None):
         """Add an input or output pin to the pin database.
 
@@ -225,7 +335,26 @@ class Manager:
             Initial value of an output channel, e.g. `GPIO.HIGH`. Default value
             is :obj:`None`.
 
+        .. note::
+
+            If the channel is already setup in the same direction, no new
+            :class:`~SimulRPi.pindb.Pin` is created and only the
+            `pull_up_down` value of an input channel or the `initial` value
+            of an output channel (if any) is updated, like with
+            ``RPi.GPIO``. Thus, repeated setups of a channel are cheap.
+
+            An input channel's state is left unchanged whatever its
+            `pull_up_down` value since it is simulated as idling `HIGH`: a
+            pressed keyboard key drives it `LOW`.
+
         """
+        pin = self.pin_db.get_pin_from_channel(channel_number)
+        if pin and pin.channel_type == channel_type:
+            if channel_type == SimulRPi.GPIO.IN and pull_up_down is not None:
+                pin.pull_up_down = pull_up_down
+            elif channel_type == SimulRPi.GPIO.OUT and initial is not None:
+                pin.state = initial
+            return
         key = None
         tmp_info = self._channel_tmp_info.get(channel_number, {})
         if channel_type == SimulRPi.GPIO.IN:
@@ -305,7 +434,9 @@ class Manager:
 
             :meth:`display_leds` should be run by a thread and eventually
             stopped from the main program by setting its ``do_run`` attribute
-            to `False` to let the thread exit from its target function.
+            to `False` to let the thread exit from its target function. The
+            event ``leds_updated`` can also be set to wake up the thread right
+            away instead of after at most ``DISPLAY_REFRESH_TIMEOUT`` seconds.
 
             **For example**:
 
@@ -318,6 +449,7 @@ class Manager:
 
                 # Time to stop thread
                 th.do_run = False
+                self.leds_updated.set()
                 th.join()
 
         .. note::
@@ -344,8 +476,15 @@ class Manager:
             os.system("tput civis")
             print()
         th = threading.currentThread()
-        # TODO: reduce number of prints, i.e. computations
+        leds_updated = self.leds_updated
+        # Format of each LED (symbol and channel), built once for all redraws
+        led_format = "{led_symbol}  [{channel}]" + " " * 8
         while getattr(th, "do_run", True):
+            # Redraw the LEDs only when they are updated instead of in a busy
+            # loop. The event is cleared before reading the pins' states so an
+            # update done while drawing is not missed.
+            leds_updated.wait(DISPLAY_REFRESH_TIMEOUT)
+            leds_updated.clear()
             leds = ""
             last_msg_length = len(leds) if leds else 0
             # test = 1/0
@@ -364,11 +503,8 @@ class Manager:
                     led_symbol = pin.led_symbols.get(
                         'OFF', self.default_led_symbols['OFF'])
                 channel = pin.channel_name if pin.channel_name else channel
-                leds += "{led_symbol}{spaces1}[{channel}]{spaces2}".format(
-                    spaces1="  ",
-                    led_symbol=led_symbol,
-                    channel=channel,
-                    spaces2=" " * 8)
+                leds += led_format.format(led_symbol=led_symbol,
+                                          channel=channel)
             if self.enable_printing:
                 print(' ' * last_msg_length, end='\r')
                 print('  {}'.format(leds), end='\r')
@@ -376,6 +512,29 @@ class Manager:
             print('  {}'.format(leds))
         logger.debug("Stopping thread: {}".format(th.name))
 
+    def event_detected(self, channel_number):
+        """Check if an edge was detected on an input channel since the last
+        call.
+
+        Parameters
+        ----------
+        channel_number : int
+            GPIO channel number of an input channel whose edge detection was
+            enabled with :meth:`add_event_detect`.
+
+        Returns
+        -------
+        retval : bool
+            Returns `True` if an edge was detected since the last call.
+            Otherwise, it returns `False`.
+
+        """
+        event_detect = self.event_detects.get(channel_number)
+        if event_detect and event_detect['detected']:
+            event_detect['detected'] = False
+            return True
+        return False
+
     @staticmethod
     def get_key_name(key):
         """Get the name of a keyboard key as a string.
@@ -454,10 +613,11 @@ class Manager:
         """
         try:
             # test = 1/0
-            self.pin_db.set_pin_state_from_key(self.get_key_name(key),
-                                               state=SimulRPi.GPIO.LOW)
+            self._set_pin_state_from_key(self.get_key_name(key),
+                                         SimulRPi.GPIO.LOW)
         except Exception as e:
             self.th_listener.exc = e
+            self.th_exception_caught.set()
 
     def on_release(self, key):
         """When a valid keyboard key is released, set the associated pin's
@@ -499,10 +659,23 @@ class Manager:
         """
         try:
             # test = 1/0
-            self.pin_db.set_pin_state_from_key(self.get_key_name(key),
-                                               state=SimulRPi.GPIO.HIGH)
+            self._set_pin_state_from_key(self.get_key_name(key),
+                                         SimulRPi.GPIO.HIGH)
         except Exception as e:
             self.th_listener.exc = e
+            self.th_exception_caught.set()
+
+    def remove_event_detect(self, channel_number):
+        """Disable the edge detection for an input channel.
+
+        Parameters
+        ----------
+        channel_number : int
+            GPIO channel number of an input channel whose edge detection will
+            be disabled. Nothing is done if it is not enabled.
+
+        """
+        self.event_detects.pop(channel_number, None)
 
     def update_channel_names(self, new_channel_names):
         """Update the channels names for multiple channels.
@@ -756,6 +929,46 @@ class Manager:
             led_symbols = self.default_led_symbols
         return led_symbols
 
+    def _set_pin_state_from_key(self, key, state):
+        """Set the state of the input pin associated with a keyboard key and
+        process the edge if the state changed.
+
+        If the edge detection is enabled for the pin's channel and the edge
+        is of the type being detected (and outside the bounce time), the edge
+        is marked as detected for :meth:`event_detected` and the channel's
+        callbacks are called.
+
+        Parameters
+        ----------
+        key : str
+            The name of the pressed/released keyboard key.
+        state : int
+            State the GPIO channel should take: 1 (`HIGH`) or 0 (`LOW`).
+
+        """
+        pin = self.pin_db.get_pin_from_key(key)
+        # NOTE: a key held down keeps calling on_press(), but only the first
+        # call changes the pin's state
+        if pin is None or pin.state == state:
+            return
+        pin.state = state
+        event_detect = self.event_detects.get(pin.channel_number)
+        if event_detect is None:
+            return
+        edge = SimulRPi.GPIO.FALLING if state == SimulRPi.GPIO.LOW \
+            else SimulRPi.GPIO.RISING
+        if event_detect['edge'] not in [edge, SimulRPi.GPIO.BOTH]:
+            return
+        now = time.monotonic()
+        last_edge_time = event_detect['last_edge_time']
+        if event_detect['bouncetime'] and last_edge_time is not None and \
+                (now - last_edge_time) * 1000 < event_detect['bouncetime']:
+            return
+        event_detect['last_edge_time'] = now
+        event_detect['detected'] = True
+        for callback in event_detect['callbacks']:
+            callback(pin.channel_number)
+
     def _update_attribute_pins(self, attribute_name, new_attributes):
         """TODO
 
@@ -41,16 +41,16 @@ Run the code for example 1 on your **computer** using the simulation module
 
 """
 # TODO: add printing or logging
-import argparse
+import os
+import signal
+import sys
+import threading
 import time
-import traceback
+from collections import namedtuple
 
 from SimulRPi import __version__
 from SimulRPi.mapping import default_channel_to_key_map
-from SimulRPi.utils import blink_led, turn_off_led, turn_on_led
 
-GPIO = None
-SIMULATION = False
 # TODO: necessary? maybe in a separate file
 DEFAULT_BUTTON_CHANNEL = 17
 DEFAULT_KEY_NAME = default_channel_to_key_map[DEFAULT_BUTTON_CHANNEL]
@@ -58,37 +58,104 @@ DEFAULT_LED_CHANNELS = [9, 10, 11]
 DEFAULT_TOTAL_TIME_BLINKING = 4
 DEFAULT_TIME_LEDS_ON = 1
 DEFAULT_TIME_LEDS_OFF = 1
+# Time in milliseconds during which a button's bounces are ignored
+BUTTON_BOUNCETIME = 50
+# Time in seconds between two checks of the stop event while waiting for a
+# button to be pressed
+_STOP_CHECK_INTERVAL = 0.1
+# Banners shown at the start of each code example. Indexing ``_PLURAL`` with
+# a boolean gives the plural suffix (e.g. ``_PLURAL[time >= 2]``)
+_PLURAL = ("", "s")
+_EX1_BANNER = "Ex 1: turn ON a LED for {time} second{plural}\n"
+_EX2_BANNER = "Ex 2: turn ON {nb_leds} LED{plural1} for a total of {time} " \
+              "second{plural2}\n"
+_EX3_BANNER = "Ex 3: detect if the {key_or_button} [{channel}] is pressed\n"
+_EX4_BANNER = "Ex 4: blink a LED for {time} second{plural}\n"
+_EX5_BANNER = "Ex 5: if the {key_or_button} [{button_channel}] is pressed, " \
+              "blink a LED [{led_channel}] for {time} second{plural}\n"
+# Messages shown while waiting for the button (or its keyboard key)
+_PRESS_MSG = "\nPress the {} to exit..."
+_PRESS_TO_TURN_ON_MSG = "\nPress the {} to turn on light ..."
+_PRESSED_MSG = "\nThe {} was pressed!"
+
+
+class ExampleContext:
+    """Class that holds what the code examples need from :meth:`main`.
 
+    Parameters
+    ----------
+    gpio : module
+        The GPIO module used by the code examples: `SimulRPi.GPIO`_ in
+        simulation mode or `RPi.GPIO`_ otherwise.
+    simulation : bool
+        Whether the simulation mode is enabled.
+    stop_event : threading.Event, optional
+        Event that stops the code examples early when it is set, e.g. by
+        :meth:`main` when :obj:`ctrl` + :obj:`c` is pressed. By default, a
+        new event is created which means the code examples run until
+        completion.
 
-def _show_msg(msg, channel=None):
-    if SIMULATION:
-        if channel:
-            key_name = GPIO.manager.channel_to_key_map[channel]
-            msg = msg.format("key '{}'".format(key_name))
-    else:
-        msg = msg.format("button")
-    print(msg)
+    """
+    def __init__(self, gpio, simulation, stop_event=None):
+        self.gpio = gpio
+        self.simulation = simulation
+        self.stop_event = stop_event or threading.Event()
+
+
+def _get_key_or_button(ctx, channel):
+    """Return how the button on the given input channel is named in messages.
 
+    It is the associated keyboard key (e.g. "key 'cmd_r'") when simulating,
+    "button" otherwise. It is computed once per code example and reused by
+    all its messages.
+
+    """
+    if ctx.simulation:
+        return "key '{}'".format(ctx.gpio.manager.channel_to_key_map[channel])
+    return "button"
 
-def _show_msg_pressed_button(channel):
-    _show_msg("\nThe {} was pressed!", channel)
 
+def _wait_for_button(ctx, channel):
+    """Wait until the button on the given input channel is pressed.
 
-def _show_msg_to_press_key(channel):
-    _show_msg("\nPress the {} to exit...", channel)
+    The button press is detected with the GPIO module's edge detection (with
+    debounce) instead of polling the channel's state.
 
+    Returns `True` if the button was pressed or `False` if the context's stop
+    event was set first. When simulating, an exception caught by the
+    listening (or displaying) thread is raised while waiting.
 
-def _show_msg_to_turn_on(channel):
-    _show_msg("\nPress the {} to turn on light ...", channel)
+    """
+    GPIO, is_stopped = ctx.gpio, ctx.stop_event.is_set
+    # NOTE: only SimulRPi.GPIO has wait() which raises the threads' exceptions
+    raise_thread_exception = GPIO.wait if ctx.simulation else None
+    pressed = threading.Event()
+    GPIO.add_event_detect(channel, GPIO.FALLING,
+                          callback=lambda ch: pressed.set(),
+                          bouncetime=BUTTON_BOUNCETIME)
+    try:
+        while not pressed.wait(_STOP_CHECK_INTERVAL):
+            if is_stopped():
+                return False
+            # The listening thread's exception would otherwise never be
+            # raised since we are not calling input()
+            if raise_thread_exception:
+                raise_thread_exception(0)
+        return True
+    finally:
+        GPIO.remove_event_detect(channel)
 
 
-def ex1_turn_on_led(channel, time_led_on=3):
+def ex1_turn_on_led(ctx, channel, time_led_on=3):
     """**Example 1:** Turn ON a LED for some specified time.
 
     A LED will be turned on for ``time_led_on`` seconds.
 
     Parameters
     ----------
+    ctx : ExampleContext
+        The GPIO module used by the example, whether the simulation mode is
+        enabled and the event that stops the example.
     channel : int
         Output channel number based on the numbering system you have
         specified (`BOARD` or `BCM`).
@@ -97,23 +164,25 @@ def ex1_turn_on_led(channel, time_led_on=3):
         seconds.
 
     """
-    print("Ex 1: turn ON a LED for {time} second{plural}\n".format(
-            channel=channel,
-            time=time_led_on,
-            plural="s" if time_led_on >= 2 else ""
-    ))
+    from SimulRPi.utils import turn_on_led
+    print(_EX1_BANNER.format(time=time_led_on,
+                             plural=_PLURAL[time_led_on >= 2]))
+    GPIO, stop_event = ctx.gpio, ctx.stop_event
     GPIO.setup(channel, GPIO.OUT)
     turn_on_led(channel)
-    time.sleep(time_led_on)
+    stop_event.wait(time_led_on)
 
 
-def ex2_turn_on_many_leds(channels, time_leds_on=3):
+def ex2_turn_on_many_leds(ctx, channels, time_leds_on=3):
     """**Example 2:** Turn ON multiple LEDs for some specified time.
 
     All LEDs will be turned on for ``time_leds_on`` seconds.
 
     Parameters
     ----------
+    ctx : ExampleContext
+        The GPIO module used by the example, whether the simulation mode is
+        enabled and the event that stops the example.
     channels : list
         List of output channel numbers based on the numbering system you have
         specified (`BOARD` or `BCM`).
@@ -122,19 +191,18 @@ def ex2_turn_on_many_leds(channels, time_leds_on=3):
         seconds.
 
     """
-    msg = "Ex 2: turn ON {nb_leds} LED{plural1} for a total of {time} " \
-          "second{plural2}\n".format(
-            nb_leds=len(channels),
-            plural1="s" if len(channels) > 1 else "",
-            time=time_leds_on,
-            plural2="s" if time_leds_on >= 2 else "")
-    print(msg)
+    from SimulRPi.utils import turn_on_led
+    print(_EX2_BANNER.format(nb_leds=len(channels),
+                             plural1=_PLURAL[len(channels) > 1],
+                             time=time_leds_on,
+                             plural2=_PLURAL[time_leds_on >= 2]))
+    GPIO, stop_event = ctx.gpio, ctx.stop_event
     GPIO.setup(channels, GPIO.OUT)
     turn_on_led(channels)
-    time.sleep(time_leds_on)
+    stop_event.wait(time_leds_on)
 
 
-def ex3_detect_button(channel):
+def ex3_detect_button(ctx, channel):
     """**Example 3:** Detect if a button is pressed.
 
     The function waits for the button to be pressed associated with the given
@@ -143,6 +211,9 @@ def ex3_detect_button(channel):
 
     Parameters
     ----------
+    ctx : ExampleContext
+        The GPIO module used by the example, whether the simulation mode is
+        enabled and the event that stops the example.
     channel : int
         Input channel number based on the numbering system you have specified
         (`BOARD` or `BCM`).
@@ -156,18 +227,17 @@ def ex3_detect_button(channel):
         name, e.g. '*ctrl*'). See `script's usage`_.
 
     """
-    msg = "Ex 3: detect if the {key_or_button} [{channel}] is pressed\n".format(
-        key_or_button="{}", channel=channel)
-    _show_msg(msg, channel)
+    GPIO = ctx.gpio
+    key_or_button = _get_key_or_button(ctx, channel)
+    print(_EX3_BANNER.format(key_or_button=key_or_button, channel=channel))
     GPIO.setup(channel, GPIO.IN, pull_up_down=GPIO.PUD_UP)
-    _show_msg_to_press_key(channel)
-    while True:
-        if not GPIO.input(channel):
-            _show_msg_pressed_button(channel)
-            break
+    print(_PRESS_MSG.format(key_or_button))
+    if _wait_for_button(ctx, channel):
+        print(_PRESSED_MSG.format(key_or_button))
 
 
-def ex4_blink_led(channel, total_time_blinking=4, time_led_on=0.5, time_led_off=0.5):
+def ex4_blink_led(ctx, channel, total_time_blinking=4, time_led_on=0.5,
+                  time_led_off=0.5):
     """**Example 4:** Blink a LED for some specified time.
 
     The led will blink for a total of ``total_time_blinking`` seconds. The LED
@@ -180,6 +250,9 @@ def ex4_blink_led(channel, total_time_blinking=4, time_led_on=0.5, time_led_off=
 
     Parameters
     ----------
+    ctx : ExampleContext
+        The GPIO module used by the example, whether the simulation mode is
+        enabled and the event that stops the example.
     channel : int
         Output channel number based on the numbering system you have specified
         (`BOARD` or `BCM`).
@@ -194,21 +267,21 @@ def ex4_blink_led(channel, total_time_blinking=4, time_led_on=0.5, time_led_off=
         value is 0.5 second.
 
     """
-    msg = "Ex 4: blink a LED for {time} second{plural}\n".format(
-            time=total_time_blinking,
-            plural="s" if total_time_blinking >= 2 else "")
-    print(msg)
+    from SimulRPi.utils import blink_led
+    GPIO, stop_event = ctx.gpio, ctx.stop_event
+    print(_EX4_BANNER.format(time=total_time_blinking,
+                             plural=_PLURAL[total_time_blinking >= 2]))
     GPIO.setup(channel, GPIO.OUT)
-    start = time.time()
-    while (time.time() - start) < total_time_blinking:
-        try:
-            blink_led(channel, time_led_on, time_led_off)
-        except KeyboardInterrupt:
-            break
+    # Bind the callables used at each iteration to locals
+    now, is_stopped = time.perf_counter, stop_event.is_set
+    deadline = now() + total_time_blinking
+    while not is_stopped() and now() < deadline:
+        blink_led(channel, time_led_on, time_led_off, stop_event)
 
 
-def ex5_blink_led_if_button(led_channel, button_channel, total_time_blinking=4,
-                            time_led_on=0.5, time_led_off=0.5):
+def ex5_blink_led_if_button(ctx, led_channel, button_channel,
+                            total_time_blinking=4, time_led_on=0.5,
+                            time_led_off=0.5):
     """**Example 5:** If a button is pressed, blink a LED for some specified
     time.
 
@@ -224,6 +297,9 @@ def ex5_blink_led_if_button(led_channel, button_channel, total_time_blinking=4,
 
     Parameters
     ----------
+    ctx : ExampleContext
+        The GPIO module used by the example, whether the simulation mode is
+        enabled and the event that stops the example.
     led_channel : int
         Output channel number based on the numbering system you have specified
         (`BOARD` or `BCM`).
@@ -251,27 +327,53 @@ def ex5_blink_led_if_button(led_channel, button_channel, total_time_blinking=4,
     .. TODO: find if we can avoid duplicates of notes and other notices
 
     """
-    msg = "Ex 5: if the {key_or_button} [{button_channel}] is pressed, blink " \
-          "a LED [{led_channel}] for {time} second{plural}\n".format(
-            key_or_button="{}",
-            button_channel=button_channel,
-            led_channel=led_channel,
-            time=total_time_blinking,
-            plural="s" if total_time_blinking >= 2 else "")
-    _show_msg(msg, button_channel)
+    from SimulRPi.utils import blink_led
+    GPIO, stop_event = ctx.gpio, ctx.stop_event
+    key_or_button = _get_key_or_button(ctx, button_channel)
+    print(_EX5_BANNER.format(key_or_button=key_or_button,
+                             button_channel=button_channel,
+                             led_channel=led_channel,
+                             time=total_time_blinking,
+                             plural=_PLURAL[total_time_blinking >= 2]))
     GPIO.setup(led_channel, GPIO.OUT)
     GPIO.setup(button_channel, GPIO.IN, pull_up_down=GPIO.PUD_UP)
-    _show_msg_to_turn_on(button_channel)
-    while True:
-        try:
-            if not GPIO.input(button_channel):
-                _show_msg_pressed_button(button_channel)
-                start = time.time()
-                while (time.time() - start) < total_time_blinking:
-                    blink_led(led_channel, time_led_on, time_led_off)
-                break
-        except KeyboardInterrupt:
-            break
+    print(_PRESS_TO_TURN_ON_MSG.format(key_or_button))
+    if _wait_for_button(ctx, button_channel):
+        print(_PRESSED_MSG.format(key_or_button))
+        # Bind the callables used at each iteration to locals
+        now, is_stopped = time.perf_counter, stop_event.is_set
+        deadline = now() + total_time_blinking
+        while not is_stopped() and now() < deadline:
+            blink_led(led_channel, time_led_on, time_led_off, stop_event)
+
+
+# An example runs with the context and the parsed command-line arguments, and
+# its LED channels are turned off once it is done
+Example = namedtuple("Example", ["run", "get_led_channels"])
+# Maps each example number to its Example
+EXAMPLES = {
+    1: Example(
+        run=lambda ctx, args: ex1_turn_on_led(
+            ctx, args.led_channels[0], args.time_leds_on),
+        get_led_channels=lambda args: args.led_channels[:1]),
+    2: Example(
+        run=lambda ctx, args: ex2_turn_on_many_leds(
+            ctx, args.led_channels, args.time_leds_on),
+        get_led_channels=lambda args: args.led_channels),
+    3: Example(
+        run=lambda ctx, args: ex3_detect_button(ctx, args.button_channel),
+        get_led_channels=lambda args: []),
+    4: Example(
+        run=lambda ctx, args: ex4_blink_led(
+            ctx, args.led_channels[0], args.total_time_blinking,
+            args.time_leds_on, args.time_leds_off),
+        get_led_channels=lambda args: args.led_channels[:1]),
+    5: Example(
+        run=lambda ctx, args: ex5_blink_led_if_button(
+            ctx, args.led_channels[0], args.button_channel,
+            args.total_time_blinking, args.time_leds_on, args.time_leds_off),
+        get_led_channels=lambda args: args.led_channels[:1]),
+}
 
 
 def setup_argparser():
@@ -293,6 +395,9 @@ def setup_argparser():
        <https://docs.python.org/3.7/library/argparse.html#argparse.Namespace>`_.
 
     """
+    # NOTE: argparse is imported here since it is the slowest import of this
+    # module and it isn't needed when only printing the version
+    import argparse
     # Setup the parser
     parser = argparse.ArgumentParser(
         # usage="%(prog)s [OPTIONS]",
@@ -368,16 +473,24 @@ def main():
     If the simulation flag (`-s`) is used, then the `SimulRPi.GPIO`_ module
     will be used which partly fakes `RPi.GPIO`_.
 
+    Pressing :obj:`ctrl` + :obj:`c` doesn't raise :exc:`KeyboardInterrupt`
+    while a code example is running. Instead, it sets the event given to the
+    code example so that it stops as soon as possible.
+
     Notes
     -----
     Only one action at a time can be performed.
 
     """
-    global GPIO, SIMULATION
+    # Fast path: no need to build the whole argument parser just to print the
+    # version
+    if sys.argv[1:] in (['-v'], ['--version']):
+        # Same output as argparse's version action
+        print('{} {}'.format(os.path.basename(sys.argv[0]), __version__))
+        return 0
     args = setup_argparser()
     if args.simulation:
         import SimulRPi.GPIO as GPIO
-        SIMULATION = True
         print("Simulation mode enabled")
         if args.key_name != DEFAULT_KEY_NAME:
             key_channel_map = {args.key_name: args.button_channel}
@@ -388,51 +501,48 @@ def main():
         import RPi.GPIO as GPIO
     # Make sure utils uses the correct GPIO module based on whether we are working
     # with the real GPIO or the fake one (simulation)
+    # NOTE: utils is imported here and not at the top of the module since it
+    # imports a GPIO module on its own
     import SimulRPi.utils as utils
-    utils.GPIO = GPIO
+    utils.set_backend(GPIO)
     # =======
     # Actions
     # =======
     retcode = 0
     # Set the numbering system used to identify the I/O pins on an RPi
-    modes = {'BOARD': GPIO.BOARD, 'BCM': GPIO.BCM}
-    GPIO.setmode(modes[args.mode.upper()])
+    # NOTE: argparse already restricts the mode to the exact names of the
+    # GPIO module's constants (BCM or BOARD)
+    GPIO.setmode(getattr(GPIO, args.mode))
     led_channels = []
+    # ctrl + c sets this event instead of raising KeyboardInterrupt
+    stop_event = threading.Event()
+    old_sigint_handler = signal.signal(
+        signal.SIGINT, lambda signum, frame: stop_event.set())
+    ctx = ExampleContext(GPIO, args.simulation, stop_event)
     try:
-        if args.example_number == 1:
-            ex1_turn_on_led(args.led_channels[0], args.time_leds_on)
-            led_channels.append(args.led_channels[0])
-        elif args.example_number == 2:
-            ex2_turn_on_many_leds(args.led_channels, args.time_leds_on)
-            led_channels.append(args.led_channels)
-        elif args.example_number == 3:
-            ex3_detect_button(args.button_channel)
-        elif args.example_number == 4:
-            ex4_blink_led(args.led_channels[0], args.total_time_blinking,
-                          args.time_leds_on, args.time_leds_off)
-        elif args.example_number == 5:
-            ex5_blink_led_if_button(args.led_channels[0], args.button_channel,
-                                    args.total_time_blinking,
-                                    args.time_leds_on,
-                                    args.time_leds_off)
+        example = EXAMPLES.get(args.example_number)
+        if example:
+            example.run(ctx, args)
+            led_channels = example.get_led_channels(args)
         else:
             print("Example # {} not found".format(args.example_number))
-        if SIMULATION:
+            retcode = 1
+        if args.simulation:
             GPIO.wait(0.5)
     except Exception:
+        import traceback
         retcode = 1
         traceback.print_exc()
-    except KeyboardInterrupt:
-        # ctrl + c
-        pass
     finally:
-        if SIMULATION:
+        signal.signal(signal.SIGINT, old_sigint_handler)
+        if args.simulation:
             GPIO.setprinting(False)
         # Turn off all LEDs
-        for ch in led_channels:
-            turn_off_led(ch)
+        if led_channels:
+            utils.turn_off_led(led_channels)
         # Cleanup will be performed after each code example's function exits
-        # or when there is an exception (including ctrl+c = KeyboardInterrupt)
+        # (including when it is stopped with ctrl+c) or when there is an
+        # exception
         GPIO.cleanup()
         return retcode
 
@@ -18,17 +18,16 @@ GPIO.setmode(GPIO.BCM)
 GPIO.setup(led_channel, GPIO.OUT)
 GPIO.setup(button_channel, GPIO.IN, pull_up_down=GPIO.PUD_UP)
 print(msg1)
-while True:
-    try:
-        if not GPIO.input(button_channel):
-            print(msg2)
-            start = time.time()
-            while (time.time() - start) < 3:
-                GPIO.output(led_channel, GPIO.HIGH)
-                time.sleep(0.5)
-                GPIO.output(led_channel, GPIO.LOW)
-                time.sleep(0.5)
-            break
-    except KeyboardInterrupt:
-        break
+try:
+    # Block until the button is pressed instead of polling its state
+    GPIO.wait_for_edge(button_channel, GPIO.FALLING)
+    print(msg2)
+    deadline = time.perf_counter() + 3
+    while time.perf_counter() < deadline:
+        GPIO.output(led_channel, GPIO.HIGH)
+        time.sleep(0.5)
+        GPIO.output(led_channel, GPIO.LOW)
+        time.sleep(0.5)
+except KeyboardInterrupt:
+    pass
 GPIO.cleanup()
@@ -7,8 +7,17 @@ try:
 except ImportError:
     import SimulRPi.GPIO as GPIO
 
+# Time in seconds at the end of a sleep that is busy-waited instead of slept
+# since ``time.sleep()`` can overshoot by the OS timer slack
+_SLEEP_MARGIN = 5e-4
+# GPIO module's output function and output states, bound once instead of
+# being looked up from the GPIO module at every LED update. See set_backend().
+_output = GPIO.output
+_HIGH = GPIO.HIGH
+_LOW = GPIO.LOW
 
-def blink_led(channel, time_led_on, time_led_off):
+
+def blink_led(channel, time_led_on, time_led_off, stop_event=None):
     """Blink LEDs from the given channels.
 
     LEDs on the given ``channel`` will be turned ON and OFF for ``time_led_on``
@@ -19,15 +28,74 @@ def blink_led(channel, time_led_on, time_led_off):
     channel : int or list or tuple
         Channel numbers associated with the LEDs which will blink.
     time_led_on : float
-        Time in seconds the LEDs will stay turned ON at a time.
+        Time in seconds the LEDs will stay turned ON at a time. If it is 0,
+        the LEDs are turned OFF right away without sleeping.
     time_led_off : float
-       Time in seconds the LEDs will stay turned OFF at a time.
+       Time in seconds the LEDs will stay turned OFF at a time. If it is 0,
+       the function returns right away without sleeping.
+    stop_event : threading.Event, optional
+        If it is given, the function waits on this event instead of sleeping
+        so that the blinking can be interrupted by setting it: the LEDs are
+        then turned OFF (if they were ON) and the function returns right away.
+        The waits are as precise as :meth:`precise_sleep`. By default, the
+        function sleeps and can't be interrupted.
+
+    """
+    # NOTE: the GPIO output function is called directly instead of going
+    # through turn_on_led() and turn_off_led()
+    _output(channel, _HIGH)
+    if stop_event is None:
+        if time_led_on:
+            precise_sleep(time_led_on)
+        _output(channel, _LOW)
+        if time_led_off:
+            precise_sleep(time_led_off)
+    else:
+        _precise_wait(stop_event, time_led_on)
+        _output(channel, _LOW)
+        _precise_wait(stop_event, time_led_off)
+
+
+def precise_sleep(duration):
+    """Sleep for the given duration with sub-millisecond precision.
+
+    The bulk of the duration is slept with :func:`time.sleep` and the last
+    ``_SLEEP_MARGIN`` seconds are busy-waited on :func:`time.perf_counter`.
+    Hence, the sleep doesn't overshoot by the OS timer slack which matters when
+    LEDs blink with small ON/OFF times.
+
+    Parameters
+    ----------
+    duration : float
+        Time in seconds to sleep.
+
+    """
+    end = time.perf_counter() + duration
+    if duration > _SLEEP_MARGIN:
+        time.sleep(duration - _SLEEP_MARGIN)
+    while time.perf_counter() < end:
+        pass
+
+
+def set_backend(gpio_module):
+    """Set the GPIO module used by the LED functions.
+
+    It replaces :data:`GPIO` and binds the module's output function and states
+    used by the LED functions, e.g. to work with ``SimulRPi.GPIO`` even if
+    ``RPi.GPIO`` is installed.
+
+    Parameters
+    ----------
+    gpio_module : module
+        The GPIO module (``RPi.GPIO`` or ``SimulRPi.GPIO``) whose
+        :meth:`output`, `HIGH` and `LOW` will be used.
 
     """
-    turn_on_led(channel)
-    time.sleep(time_led_on)
-    turn_off_led(channel)
-    time.sleep(time_led_off)
+    global GPIO, _output, _HIGH, _LOW
+    GPIO = gpio_module
+    _output = gpio_module.output
+    _HIGH = gpio_module.HIGH
+    _LOW = gpio_module.LOW
 
 
 def turn_off_led(channel):
@@ -39,7 +107,7 @@ def turn_off_led(channel):
         Channel numbers associated with LEDs which will be turned off.
 
     """
-    GPIO.output(channel, GPIO.LOW)
+    _output(channel, _LOW)
 
 
 def turn_on_led(channel):
@@ -51,4 +119,34 @@ def turn_on_led(channel):
         Channel numbers associated with LEDs which will be turned on.
 
     """
-    GPIO.output(channel, GPIO.HIGH)
+    _output(channel, _HIGH)
+
+
+def _precise_wait(event, duration):
+    """Wait on an event for the given duration with sub-millisecond precision.
+
+    Like :meth:`precise_sleep` but the bulk of the duration is waited on
+    ``event`` instead of slept since :meth:`threading.Event.wait` also
+    overshoots by the OS timer slack.
+
+    Parameters
+    ----------
+    event : threading.Event
+        The wait stops as soon as this event is set.
+    duration : float
+        Time in seconds to wait.
+
+    Returns
+    -------
+    is_set : bool
+        :obj:`True` if the event was set, :obj:`False` if the duration
+        expired.
+
+    """
+    end = time.perf_counter() + duration
+    if duration > _SLEEP_MARGIN and event.wait(duration - _SLEEP_MARGIN):
+        return True
+    while time.perf_counter() < end:
+        if event.is_set():
+            return True
+    return event.is_set()
@@ -14,6 +14,46 @@ Also, to execute a specific test, this is the command::
 This command is executed at the root of the project directory.
 
 """
+import logging
+from logging import NullHandler
 
-from pyutils import install_colored_logger
-install_colored_logger()
+_logger_installed = False
+
+
+def get_test_logger(name):
+    """Get a test module's logger with exactly one :class:`logging.NullHandler`.
+
+    The handler is not added again if the test module is imported more than
+    once (e.g. reloaded).
+
+    Parameters
+    ----------
+    name : str
+        Name of the logger, i.e. the test module's ``__name__``.
+
+    Returns
+    -------
+    logger : logging.Logger
+        The test module's logger.
+
+    """
+    test_logger = logging.getLogger(name)
+    if not any(isinstance(h, NullHandler) for h in test_logger.handlers):
+        test_logger.addHandler(NullHandler())
+    return test_logger
+
+
+def install_logger():
+    """Install the colored logger used by the tests only once.
+
+    It is called by each test module's ``setUpModule()`` so that the logger is
+    only installed when tests are actually run, not when they are only
+    discovered. The logging handlers are not scanned and reconfigured again if
+    this function is called by more than one test module.
+
+    """
+    global _logger_installed
+    if not _logger_installed:
+        from pyutils import install_colored_logger
+        install_colored_logger()
+        _logger_installed = True
@@ -0,0 +1,371 @@
+import threading
+import time
+import unittest
+from unittest import mock
+
+from SimulRPi import GPIO
+from pyutils.genutils import get_qualname
+from pyutils.testutils import TestBase
+from tests import get_test_logger, install_logger
+
+logger = get_test_logger(__name__)
+
+# Input channel of the button setup before each test and output channel used
+# where an input channel is not expected
+BUTTON_CHANNEL = 17
+LED_CHANNEL = 10
+# Bounce time in milliseconds used by the edge detection
+BOUNCETIME = 50
+# Time in seconds after which the button is pressed from another thread (or
+# wait_for_edge() and wait() time out), and maximum difference in seconds allowed
+# between the measured and expected durations
+EDGE_DELAY = 0.05
+DURATION_DELTA = 0.05
+# Qualified name of the tested module, computed once
+_GPIO_QUALNAME = get_qualname(GPIO)
+
+
+def setUpModule():
+    install_logger()
+
+
+class TestGPIO(TestBase):
+    TEST_MODULE_QUALNAME = _GPIO_QUALNAME
+    LOGGER_NAME = __name__
+    SHOW_FIRST_CHARS_IN_LOG = 0
+    CREATE_SANDBOX_TMP_DIR = False
+    CREATE_DATA_TMP_DIR = False
+
+    def setUp(self):
+        super().setUp()
+        GPIO.setprinting(False)
+        GPIO.setmode(GPIO.BCM)
+        GPIO.setup(BUTTON_CHANNEL, GPIO.IN, pull_up_down=GPIO.PUD_UP)
+        # NOTE: the keyboard is not used, the button's key is pressed and
+        # released by calling the manager directly
+        self.key = GPIO.manager.channel_to_key_map[BUTTON_CHANNEL]
+
+    def tearDown(self):
+        # NOTE: cleanup() replaces GPIO.manager, thus each test starts with
+        # no edge detection enabled
+        GPIO.cleanup()
+        super().tearDown()
+
+    # @unittest.skip("test_add_event_callback_without_detection()")
+    def test_add_event_callback_without_detection(self):
+        self.log_test_method_name()
+        extra_msg = "Case where a callback is added to a channel <color>" \
+                    "without edge detection</color>"
+        self.log_main_message(extra_msg=extra_msg)
+        with self.assertRaises(RuntimeError):
+            GPIO.add_event_callback(BUTTON_CHANNEL, lambda ch: None)
+
+    # @unittest.skip("test_add_event_detect_bouncetime()")
+    def test_add_event_detect_bouncetime(self):
+        self.log_test_method_name()
+        extra_msg = "Case where edges are checked that they are <color>" \
+                    "dropped within the bounce time</color> ({} ms)".format(
+                        BOUNCETIME)
+        self.log_main_message(extra_msg=extra_msg)
+        channels = []
+        GPIO.add_event_detect(BUTTON_CHANNEL, GPIO.FALLING,
+                              callback=channels.append,
+                              bouncetime=BOUNCETIME)
+        self._press()
+        self._release()
+        # Second falling edge within the bounce time
+        self._press()
+        self._release()
+        msg = "The second edge should be dropped since it is within the " \
+              "bounce time"
+        self.assertEqual(channels, [BUTTON_CHANNEL], msg)
+        time.sleep(2 * BOUNCETIME / 1000)
+        self._press()
+        msg = "The third edge should be accepted since it is after the " \
+              "bounce time"
+        self.assertEqual(channels, [BUTTON_CHANNEL] * 2, msg)
+
+    # @unittest.skip("test_add_event_detect_conflicting_detection()")
+    def test_add_event_detect_conflicting_detection(self):
+        self.log_test_method_name()
+        extra_msg = "Case where the edge detection is <color>enabled twice" \
+                    "</color> for the same channel"
+        self.log_main_message(extra_msg=extra_msg)
+        GPIO.add_event_detect(BUTTON_CHANNEL, GPIO.FALLING)
+        with self.assertRaises(RuntimeError):
+            GPIO.add_event_detect(BUTTON_CHANNEL, GPIO.RISING)
+
+    # @unittest.skip("test_add_event_detect_edges()")
+    def test_add_event_detect_edges(self):
+        self.log_test_method_name()
+        extra_msg = "Case where the <color>type of edge</color> detected is " \
+                    "checked when the button is pressed and released"
+        self.log_main_message(extra_msg=extra_msg)
+        # The button's state (as read by the callback) for each detected edge
+        cases = ((GPIO.FALLING, [GPIO.LOW]),
+                 (GPIO.RISING, [GPIO.HIGH]),
+                 (GPIO.BOTH, [GPIO.LOW, GPIO.HIGH]))
+        for edge, expected_states in cases:
+            with self.subTest(edge=edge):
+                states = []
+                GPIO.add_event_detect(
+                    BUTTON_CHANNEL, edge,
+                    callback=lambda ch: states.append(GPIO.input(ch)))
+                try:
+                    self._press()
+                    self._release()
+                finally:
+                    GPIO.remove_event_detect(BUTTON_CHANNEL)
+                msg = "The edges detected should have led to the states {} " \
+                      "but got {}".format(expected_states, states)
+                self.assertEqual(states, expected_states, msg)
+
+    # @unittest.skip("test_add_event_detect_held_key()")
+    def test_add_event_detect_held_key(self):
+        self.log_test_method_name()
+        extra_msg = "Case where a <color>held key</color> is checked that " \
+                    "its autorepeat is not detected as new edges"
+        self.log_main_message(extra_msg=extra_msg)
+        channels = []
+        GPIO.add_event_detect(BUTTON_CHANNEL, GPIO.FALLING,
+                              callback=channels.append)
+        # A key held down keeps being pressed
+        for _ in range(3):
+            self._press()
+        self._release()
+        msg = "Only one edge should be detected for a held key"
+        self.assertEqual(channels, [BUTTON_CHANNEL], msg)
+
+    # @unittest.skip("test_add_event_detect_invalid_channels()")
+    def test_add_event_detect_invalid_channels(self):
+        self.log_test_method_name()
+        extra_msg = "Case where the edge detection is enabled for <color>" \
+                    "channels not setup as inputs</color>"
+        self.log_main_message(extra_msg=extra_msg)
+        GPIO.setup(LED_CHANNEL, GPIO.OUT)
+        # Output channel and channel never setup
+        for channel in [LED_CHANNEL, BUTTON_CHANNEL + 1]:
+            with self.subTest(channel=channel):
+                with self.assertRaises(RuntimeError):
+                    GPIO.add_event_detect(channel, GPIO.FALLING)
+
+    # @unittest.skip("test_add_event_detect_invalid_edge()")
+    def test_add_event_detect_invalid_edge(self):
+        self.log_test_method_name()
+        extra_msg = "Case where the edge detection is enabled with an " \
+                    "<color>invalid edge</color>"
+        self.log_main_message(extra_msg=extra_msg)
+        with self.assertRaises(ValueError):
+            GPIO.add_event_detect(BUTTON_CHANNEL, GPIO.HIGH)
+
+    # @unittest.skip("test_add_event_detect_pull_down()")
+    def test_add_event_detect_pull_down(self):
+        self.log_test_method_name()
+        extra_msg = "Case where the button of a <color>pull-down input " \
+                    "channel</color> is pressed and released"
+        self.log_main_message(extra_msg=extra_msg)
+        GPIO.cleanup()
+        GPIO.setprinting(False)
+        GPIO.setmode(GPIO.BCM)
+        GPIO.setup(BUTTON_CHANNEL, GPIO.IN, pull_up_down=GPIO.PUD_DOWN)
+        msg = "The input channel should idle at state {}".format(GPIO.HIGH)
+        self.assertEqual(GPIO.input(BUTTON_CHANNEL), GPIO.HIGH, msg)
+        states = []
+        GPIO.add_event_detect(
+            BUTTON_CHANNEL, GPIO.BOTH,
+            callback=lambda ch: states.append(GPIO.input(ch)))
+        self._press()
+        self._release()
+        msg = "The first press and release should be detected as a falling " \
+              "then a rising edge"
+        self.assertEqual(states, [GPIO.LOW, GPIO.HIGH], msg)
+        msg = "The input channel should be back at state {} once " \
+              "released".format(GPIO.HIGH)
+        self.assertEqual(GPIO.input(BUTTON_CHANNEL), GPIO.HIGH, msg)
+
+    # @unittest.skip("test_event_detected()")
+    def test_event_detected(self):
+        self.log_test_method_name()
+        extra_msg = "Case where event_detected() is checked that it is " \
+                    "<color>reset once read</color>"
+        self.log_main_message(extra_msg=extra_msg)
+        GPIO.add_event_detect(BUTTON_CHANNEL, GPIO.FALLING)
+        msg = "No event should be detected before the button is pressed"
+        self.assertFalse(GPIO.event_detected(BUTTON_CHANNEL), msg)
+        self._press()
+        msg = "The event should be detected after the button is pressed"
+        self.assertTrue(GPIO.event_detected(BUTTON_CHANNEL), msg)
+        msg = "The event should be reset once read"
+        self.assertFalse(GPIO.event_detected(BUTTON_CHANNEL), msg)
+
+    # @unittest.skip("test_setup_again()")
+    def test_setup_again(self):
+        self.log_test_method_name()
+        extra_msg = "Case where a channel is <color>setup again in the same " \
+                    "direction</color>"
+        self.log_main_message(extra_msg=extra_msg)
+        pin = GPIO.manager.pin_db.get_pin_from_channel(BUTTON_CHANNEL)
+        GPIO.setup(LED_CHANNEL, GPIO.OUT)
+        led_pin = GPIO.manager.pin_db.get_pin_from_channel(LED_CHANNEL)
+        with self.subTest("no-op"):
+            GPIO.setup(BUTTON_CHANNEL, GPIO.IN)
+            GPIO.setup(LED_CHANNEL, GPIO.OUT)
+            msg = "No new pin should be created for a channel setup again"
+            self.assertIs(GPIO.manager.pin_db.get_pin_from_channel(
+                BUTTON_CHANNEL), pin, msg)
+            self.assertEqual(GPIO.manager.pin_db.output_pins, [led_pin], msg)
+            msg = "The states should be left unchanged"
+            self.assertEqual(GPIO.input(BUTTON_CHANNEL), GPIO.HIGH, msg)
+            self.assertEqual(led_pin.state, GPIO.LOW, msg)
+        with self.subTest("pull_up_down"):
+            for pull_up_down in [GPIO.PUD_DOWN, GPIO.PUD_UP]:
+                GPIO.setup(BUTTON_CHANNEL, GPIO.IN, pull_up_down=pull_up_down)
+                msg = "The input channel should have pull_up_down={}".format(
+                    pull_up_down)
+                self.assertEqual(pin.pull_up_down, pull_up_down, msg)
+                msg = "The input channel should still idle at state " \
+                      "{}".format(GPIO.HIGH)
+                self.assertEqual(GPIO.input(BUTTON_CHANNEL), GPIO.HIGH, msg)
+        with self.subTest("initial"):
+            GPIO.setup(LED_CHANNEL, GPIO.OUT, initial=GPIO.HIGH)
+            msg = "The output channel should be at state {} after being " \
+                  "setup again with initial={}".format(GPIO.HIGH, GPIO.HIGH)
+            self.assertEqual(led_pin.state, GPIO.HIGH, msg)
+        with self.subTest("direction change"):
+            with self.assertRaises(KeyError):
+                GPIO.setup(BUTTON_CHANNEL, GPIO.OUT)
+
+    # @unittest.skip("test_wait_for_edge()")
+    def test_wait_for_edge(self):
+        self.log_test_method_name()
+        extra_msg = "Case where wait_for_edge() <color>returns the channel" \
+                    "</color> once the button is pressed from another thread"
+        self.log_main_message(extra_msg=extra_msg)
+        # The button is pressed while wait_for_edge() is blocking
+        timer = threading.Timer(EDGE_DELAY, self._press)
+        timer.start()
+        try:
+            channel = GPIO.wait_for_edge(BUTTON_CHANNEL, GPIO.FALLING,
+                                         timeout=1000)
+        finally:
+            timer.cancel()
+            timer.join()
+        msg = "wait_for_edge() should return the channel {} but it returned " \
+              "{}".format(BUTTON_CHANNEL, channel)
+        self.assertEqual(channel, BUTTON_CHANNEL, msg)
+        msg = "The edge detection should be disabled after wait_for_edge()"
+        self.assertEqual(GPIO.manager.event_detects, {}, msg)
+
+    # @unittest.skip("test_wait_for_edge_conflicting_detection()")
+    def test_wait_for_edge_conflicting_detection(self):
+        self.log_test_method_name()
+        extra_msg = "Case where wait_for_edge() is called on a channel with " \
+                    "the <color>edge detection already enabled</color>"
+        self.log_main_message(extra_msg=extra_msg)
+        GPIO.add_event_detect(BUTTON_CHANNEL, GPIO.FALLING)
+        with self.assertRaisesRegex(RuntimeError,
+                                    "Conflicting edge detection"):
+            GPIO.wait_for_edge(BUTTON_CHANNEL, GPIO.FALLING, timeout=0)
+
+    # @unittest.skip("test_wait_for_edge_timeout()")
+    def test_wait_for_edge_timeout(self):
+        self.log_test_method_name()
+        extra_msg = "Case where wait_for_edge() <color>returns None</color> " \
+                    "once the timeout expires"
+        self.log_main_message(extra_msg=extra_msg)
+        # Timeouts in milliseconds
+        for timeout in [int(EDGE_DELAY * 1000), 0]:
+            with self.subTest(timeout=timeout):
+                start = time.perf_counter()
+                channel = GPIO.wait_for_edge(BUTTON_CHANNEL, GPIO.FALLING,
+                                             timeout=timeout)
+                duration = time.perf_counter() - start
+                msg = "wait_for_edge() should return None but it returned " \
+                      "{}".format(channel)
+                self.assertIs(channel, None, msg)
+                msg = "wait_for_edge() returned after {} seconds, before " \
+                      "the timeout of {} ms".format(duration, timeout)
+                self.assertGreaterEqual(duration, timeout / 1000, msg)
+                msg = "wait_for_edge() took {} seconds for a timeout of {} " \
+                      "ms".format(duration, timeout)
+                self.assertLess(duration, timeout / 1000 + DURATION_DELTA,
+                                msg)
+                msg = "The edge detection should be disabled after " \
+                      "wait_for_edge()"
+                self.assertEqual(GPIO.manager.event_detects, {}, msg)
+
+    # @unittest.skip("test_wait_thread_exception()")
+    def test_wait_thread_exception(self):
+        self.log_test_method_name()
+        extra_msg = "Case where a blocked wait() <color>raises the " \
+                    "displaying thread's exception</color> only once"
+        self.log_main_message(extra_msg=extra_msg)
+        GPIO.setup(LED_CHANNEL, GPIO.OUT)
+        GPIO.output(LED_CHANNEL, GPIO.HIGH)
+        # The displaying thread fails while wait() is blocking
+        timer = threading.Timer(EDGE_DELAY, self._break_display_thread)
+        timer.start()
+        try:
+            start = time.perf_counter()
+            with self.assertRaises(TypeError):
+                GPIO.wait(2)
+            duration = time.perf_counter() - start
+        finally:
+            timer.cancel()
+            timer.join()
+        msg = "wait() should raise the thread's exception right away but it " \
+              "took {} seconds".format(duration)
+        self.assertLess(duration, 0.5, msg)
+        self._assert_wait_blocks()
+
+    # @unittest.skip("test_wait_thread_exception_already_caught()")
+    def test_wait_thread_exception_already_caught(self):
+        self.log_test_method_name()
+        extra_msg = "Case where wait() <color>raises the displaying " \
+                    "thread's exception</color> caught before being called"
+        self.log_main_message(extra_msg=extra_msg)
+        GPIO.setup(LED_CHANNEL, GPIO.OUT)
+        GPIO.output(LED_CHANNEL, GPIO.HIGH)
+        self._break_display_thread()
+        # The thread exits once it caught the exception
+        GPIO.manager.th_display_leds.join(timeout=1)
+        with self.assertRaises(TypeError):
+            GPIO.wait(2)
+        self._assert_wait_blocks()
+
+    # @unittest.skip("test_wait_thread_exception_raised_by_output()")
+    def test_wait_thread_exception_raised_by_output(self):
+        self.log_test_method_name()
+        extra_msg = "Case where wait() is called after <color>output() " \
+                    "raised the displaying thread's exception</color>"
+        self.log_main_message(extra_msg=extra_msg)
+        GPIO.setup(LED_CHANNEL, GPIO.OUT)
+        GPIO.output(LED_CHANNEL, GPIO.HIGH)
+        self._break_display_thread()
+        GPIO.manager.th_display_leds.join(timeout=1)
+        with self.assertRaises(TypeError):
+            GPIO.output(LED_CHANNEL, GPIO.LOW)
+        self._assert_wait_blocks()
+
+    def _assert_wait_blocks(self):
+        # The exception is already raised: wait() should now block for the
+        # whole timeout
+        start = time.perf_counter()
+        GPIO.wait(EDGE_DELAY)
+        duration = time.perf_counter() - start
+        msg = "wait() should block for {} seconds but it returned after {} " \
+              "seconds".format(EDGE_DELAY, duration)
+        self.assertGreaterEqual(duration, EDGE_DELAY, msg)
+
+    def _break_display_thread(self):
+        # The displaying thread fails when iterating over the output pins
+        patcher = mock.patch.object(GPIO.manager.pin_db, "output_pins", None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        GPIO.manager.leds_updated.set()
+
+    def _press(self):
+        GPIO.manager._set_pin_state_from_key(self.key, GPIO.LOW)
+
+    def _release(self):
+        GPIO.manager._set_pin_state_from_key(self.key, GPIO.HIGH)
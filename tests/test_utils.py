@@ -1,65 +1,267 @@
-import logging
 import os
+import threading
 import time
 import unittest
-from logging import NullHandler
+from unittest import mock
 
-from SimulRPi import GPIO, utils
+from SimulRPi import GPIO, manager, utils
+from SimulRPi.manager import DISPLAY_REFRESH_TIMEOUT
 from pyutils.genutils import get_qualname
 from pyutils.testutils import TestBase
+from tests import get_test_logger, install_logger
 
-logger = logging.getLogger(__name__)
-logger.addHandler(NullHandler())
+logger = get_test_logger(__name__)
+
+# Times in seconds a LED stays turned ON and OFF when blinking, and maximum
+# difference in seconds allowed between the measured and expected durations
+TIME_LED_ON = 0.05
+TIME_LED_OFF = 0.05
+DURATION_DELTA = 0.03
+# Output channel of the LED setup once for all the tests
+LED_CHANNEL = 1
+# Blinking cases (channel, time_led_on, time_led_off) run once on the same
+# GPIO manager. A time of 0 means the LED is not slept on.
+BLINK_CASES = ((LED_CHANNEL, TIME_LED_ON, TIME_LED_OFF),
+               (2, 0.1, 0),
+               (3, 0, 0.1))
+# The listening thread is only created if pynput's keyboard could be imported
+# by SimulRPi.manager (e.g. not on travis where pynput fails to import on a
+# headless Linux)
+HAS_PYNPUT = manager.keyboard is not None
+# Qualified name of the tested module, computed once
+_UTILS_QUALNAME = get_qualname(utils)
+
+
+def setUpModule():
+    install_logger()
+
+
+class TestCleanup(TestBase):
+    TEST_MODULE_QUALNAME = _UTILS_QUALNAME
+    LOGGER_NAME = __name__
+    SHOW_FIRST_CHARS_IN_LOG = 0
+    CREATE_SANDBOX_TMP_DIR = False
+    CREATE_DATA_TMP_DIR = False
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        GPIO.setprinting(False)
+        GPIO.setmode(GPIO.BCM)
+        GPIO.setup(LED_CHANNEL, GPIO.OUT)
+        # Make sure the displaying thread is started
+        GPIO.output(LED_CHANNEL, GPIO.LOW)
+        # NOTE: cleanup() replaces GPIO.manager, so the displaying thread must
+        # be retrieved before. cleanup() is called once and each test checks
+        # one of its effects.
+        cls.th_display_leds = GPIO.manager.th_display_leds
+        # The terminal's cursor is not restored (with a slow subprocess) so
+        # that only the stopping of the threads is timed
+        with mock.patch("os.system"):
+            start = time.perf_counter()
+            GPIO.cleanup()
+            cls.cleanup_duration = time.perf_counter() - start
+
+    # @unittest.skip("test_cleanup_listener_thread()")
+    def test_cleanup_listener_thread(self):
+        self.log_test_method_name()
+        extra_msg = "Case where the new manager's <color>listener " \
+                    "thread</color> is checked after cleanup()"
+        self.log_main_message(extra_msg=extra_msg)
+        if HAS_PYNPUT:
+            msg = "The listener thread should be created since pynput can " \
+                  "be imported"
+            self.assertIsNot(GPIO.manager.th_listener, None, msg)
+        else:
+            msg = "The listener thread should not be created since pynput " \
+                  "can't be imported"
+            self.assertIs(GPIO.manager.th_listener, None, msg)
+
+    # @unittest.skip("test_cleanup_resets_mode()")
+    def test_cleanup_resets_mode(self):
+        self.log_test_method_name()
+        extra_msg = "Case where the manager's <color>mode</color> is checked " \
+                    "that it is reset by cleanup()"
+        self.log_main_message(extra_msg=extra_msg)
+        msg = "The GPIO.manager's mode should be None"
+        self.assertIs(GPIO.manager.mode, None, msg)
+
+    # @unittest.skip("test_cleanup_stops_display_thread()")
+    def test_cleanup_stops_display_thread(self):
+        self.log_test_method_name()
+        extra_msg = "Case where the <color>displaying thread</color> is " \
+                    "checked that it is stopped by cleanup()"
+        self.log_main_message(extra_msg=extra_msg)
+        msg = "The displaying thread should not be alive"
+        self.assertFalse(self.th_display_leds.is_alive(), msg)
+        # cleanup() wakes up the thread instead of waiting for its refresh
+        # timeout to expire
+        max_duration = DISPLAY_REFRESH_TIMEOUT / 2
+        msg = "cleanup() took {} seconds to stop the displaying thread. It " \
+              "should take less than {} seconds".format(self.cleanup_duration,
+                                                        max_duration)
+        self.assertLess(self.cleanup_duration, max_duration, msg)
 
 
 class TestUtils(TestBase):
-    TEST_MODULE_QUALNAME = get_qualname(utils)
+    TEST_MODULE_QUALNAME = _UTILS_QUALNAME
     LOGGER_NAME = __name__
     SHOW_FIRST_CHARS_IN_LOG = 0
     CREATE_SANDBOX_TMP_DIR = False
     CREATE_DATA_TMP_DIR = False
 
-    # @unittest.skip("test_blink_led()")
-    def test_blink_led(self):
-        enable_printing = False
-        channel = 1
-        mode = GPIO.BCM
-        time_led_on = 1
-        time_led_off = 1
-        delta = 0.5
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        GPIO.setprinting(False)
+        GPIO.setmode(GPIO.BCM)
+        channels = [case[0] for case in BLINK_CASES]
+        GPIO.setup(channels, GPIO.OUT)
+        # NOTE: setup() returns None like RPi.GPIO's, so the pins are
+        # retrieved once from the pin database for all the tests
+        get_pin = GPIO.manager.pin_db.get_pin_from_channel
+        cls.pins = {ch: get_pin(ch) for ch in channels}
+        cls.pin = cls.pins[LED_CHANNEL]
+        # Each case's LED blinks once for all the tests, each checking one of
+        # the invariants. The manager (and its displaying thread) is shared by
+        # all the cases and only cleaned up in tearDownClass(). The sleeps
+        # are stubbed: the tests don't wait for them. See
+        # test_blink_led_real_timing() for the actual duration.
+        cls.sleep_calls = {}
+        for channel, time_led_on, time_led_off in BLINK_CASES:
+            with mock.patch("SimulRPi.utils.precise_sleep") as fake_sleep:
+                utils.blink_led(channel, time_led_on, time_led_off)
+            cls.sleep_calls[channel] = fake_sleep.call_args_list
+
+    @classmethod
+    def tearDownClass(cls):
+        GPIO.cleanup()
+        super().tearDownClass()
+
+    # @unittest.skip("test_blink_led_final_state()")
+    def test_blink_led_final_state(self):
+        self.log_test_method_name()
+        extra_msg = "Case where LEDs are checked that they are <color>" \
+                    "turned OFF</color> after blinking"
+        self.log_main_message(extra_msg=extra_msg)
+        for channel, time_led_on, time_led_off in BLINK_CASES:
+            with self.subTest(channel=channel, time_led_on=time_led_on,
+                              time_led_off=time_led_off):
+                pin = self.pins[channel]
+                msg = "The pin on channel {} shouldn't be None".format(channel)
+                self.assertIsNot(pin, None, msg)
+                msg = "At the end of the blinking, the LED should be at " \
+                      "state {} but it ended with {}".format(GPIO.LOW,
+                                                             GPIO.HIGH)
+                self.assertFalse(pin.state, msg)
+
+    @unittest.skipUnless(os.environ.get("SLOW_TESTS"),
+                         "set SLOW_TESTS to run tests that really sleep")
+    def test_blink_led_real_timing(self):
+        channel = LED_CHANNEL
+        time_led_on = TIME_LED_ON
+        time_led_off = TIME_LED_OFF
+        delta = DURATION_DELTA
         self.log_test_method_name()
         extra_msg = "Case where a LED (ch={}) is checked that is <color>" \
-                    "blinking correctly</color>".format(channel)
+                    "blinking for the right duration</color>".format(channel)
         self.log_main_message(extra_msg=extra_msg)
-        GPIO.setprinting(enable_printing)
-        GPIO.setmode(mode)
-        GPIO.setup(channel, GPIO.OUT)
-        start = time.time()
+        start = time.perf_counter()
         utils.blink_led(channel, time_led_on, time_led_off)
-        end = time.time()
+        end = time.perf_counter()
         duration = end - start
-        msg = "The blinking LED is taking too long with {} seconds. It " \
-              "should take at most {} seconds".format(
-                duration,
-                time_led_on + time_led_off + delta)
-        self.assertAlmostEqual(duration, time_led_on + time_led_off,
-                               delta=delta, msg=msg)
-        pin = GPIO.manager.pin_db.get_pin_from_channel(channel)
-        msg = "The pin on channel {} shouldn't be None".format(channel)
-        self.assertIsNotNone(pin, msg)
-        msg = "At the end of the blinking, the LED should be at state {} " \
-              "but it ended with {}".format(GPIO.LOW, GPIO.HIGH)
-        self.assertFalse(pin.state, msg)
-        GPIO.cleanup()
-        # Test cleanup(): manager's attributes should be correctly set
-        msg = "The GPIO.manager's mode should be None"
-        self.assertIsNone(GPIO.manager.mode, msg)
-        msg = "The displaying thread should not be alive"
-        self.assertFalse(GPIO.manager.th_display_leds.is_alive(), msg)
-        # TODO: listener thread is not created on travis (no pynput)
-        msg = "The listener thread should not be created because testing on " \
-              "travis"
-        self.assertIsNone(GPIO.manager.th_listener, msg)
+        expected_duration = time_led_on + time_led_off
+        # The checks share the same (slow) blink but are reported separately.
+        # Asymmetric bounds: blink_led() sleeps with precise_sleep() which
+        # never wakes up early, but the scheduler can delay it.
+        with self.subTest("minimum duration"):
+            msg = "The blinking LED is too fast with {} seconds. It should " \
+                  "take at least {} seconds".format(duration,
+                                                    expected_duration)
+            self.assertGreaterEqual(duration, expected_duration, msg)
+        with self.subTest("maximum duration"):
+            msg = "The blinking LED is taking too long with {} seconds. It " \
+                  "should take at most {} seconds".format(
+                    duration,
+                    expected_duration + delta)
+            self.assertLess(duration, expected_duration + delta, msg)
+        with self.subTest("final state"):
+            msg = "At the end of the blinking, the LED should be at state " \
+                  "{} but it ended with {}".format(GPIO.LOW, GPIO.HIGH)
+            self.assertFalse(self.pin.state, msg)
         logger.info(
-            "<color>RESULT:</color> The LED blinked for {} seconds <color>as "
-            "expected</color> without errors".format(duration))
+            "<color>RESULT:</color> The LED blinked for %s seconds <color>as "
+            "expected</color> without errors", duration)
+
+    # @unittest.skip("test_blink_led_sleep_times()")
+    def test_blink_led_sleep_times(self):
+        self.log_test_method_name()
+        extra_msg = "Case where LEDs are checked that they are <color>" \
+                    "blinking with the requested times</color>"
+        self.log_main_message(extra_msg=extra_msg)
+        for channel, time_led_on, time_led_off in BLINK_CASES:
+            with self.subTest(channel=channel, time_led_on=time_led_on,
+                              time_led_off=time_led_off):
+                # A time of 0 must not be slept on
+                expected_calls = [mock.call(t) for t in (time_led_on,
+                                                         time_led_off) if t]
+                msg = "The LED should stay ON for {} seconds then OFF for " \
+                      "{} seconds".format(time_led_on, time_led_off)
+                self.assertEqual(self.sleep_calls[channel], expected_calls,
+                                 msg)
+
+    # @unittest.skip("test_blink_led_stop_event()")
+    def test_blink_led_stop_event(self):
+        channel = LED_CHANNEL
+        time_led = 10
+        self.log_test_method_name()
+        extra_msg = "Case where a LED (ch={}) is checked that it <color>stops " \
+                    "blinking</color> as soon as the stop event is " \
+                    "set".format(channel)
+        self.log_main_message(extra_msg=extra_msg)
+        stop_event = threading.Event()
+        stop_event.set()
+        start = time.perf_counter()
+        utils.blink_led(channel, time_led, time_led, stop_event)
+        duration = time.perf_counter() - start
+        msg = "The blinking LED should stop right away but it took {} " \
+              "seconds".format(duration)
+        self.assertLess(duration, DURATION_DELTA, msg)
+        msg = "After the blinking is stopped, the LED should be at state {} " \
+              "but it ended with {}".format(GPIO.LOW, GPIO.HIGH)
+        self.assertFalse(self.pin.state, msg)
+
+    # @unittest.skip("test_blink_led_stop_event_while_on()")
+    def test_blink_led_stop_event_while_on(self):
+        channel = LED_CHANNEL
+        time_led = 10
+        self.log_test_method_name()
+        extra_msg = "Case where a LED (ch={}) is checked that it <color>stops " \
+                    "blinking</color> when the stop event is set while it is " \
+                    "ON".format(channel)
+        self.log_main_message(extra_msg=extra_msg)
+        stop_event = threading.Event()
+        states = []
+
+        def stop_blinking():
+            # The LED's state when the blinking is interrupted
+            states.append(self.pin.state)
+            stop_event.set()
+
+        timer = threading.Timer(TIME_LED_ON, stop_blinking)
+        start = time.perf_counter()
+        timer.start()
+        try:
+            utils.blink_led(channel, time_led, time_led, stop_event)
+        finally:
+            timer.cancel()
+            timer.join()
+        duration = time.perf_counter() - start
+        msg = "The stop event should be set while the LED is ON"
+        self.assertEqual(states, [GPIO.HIGH], msg)
+        msg = "The blinking LED should stop once the stop event is set but " \
+              "it took {} seconds".format(duration)
+        self.assertLess(duration, TIME_LED_ON + DURATION_DELTA, msg)
+        msg = "After the blinking is stopped, the LED should be at state {} " \
+              "but it ended with {}".format(GPIO.LOW, GPIO.HIGH)
+        self.assertFalse(self.pin.state, msg)